@@ -1,8 +1,17 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 import boto3
-from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.conditions import Key, Attr, ConditionExpressionBuilder
+from boto3.dynamodb.types import DYNAMODB_CONTEXT, TypeDeserializer, TypeSerializer
+from botocore.config import Config
 from decimal import Decimal
 import json
 import logging
+import queue
+import random
+import threading
+import time
 
 
 logging.basicConfig(
@@ -12,14 +21,218 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# BatchWriteItem accepts at most 25 put/delete requests per call
+BATCH_WRITE_SIZE = 25
+
+# Backoff for resubmitting UnprocessedItems: base/cap delays in seconds
+BACKOFF_BASE = 0.05
+BACKOFF_CAP = 5.0
+
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+# Leaves room for the batch_write and parallel scan worker threads
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# DynamoDB numbers carry at most 38 significant digits
+MAX_NUMBER_DIGITS = 38
+_MAX_FAST_INT = 10 ** MAX_NUMBER_DIGITS
+
+
+def _serialize_number(v):
+    # NaN, Infinity, over-long and out-of-range numbers go through TypeSerializer
+    # so they are rejected client-side rather than by a server ValidationException
+    if isinstance(v, Decimal):
+        if (
+            not v.is_finite()
+            or len(v.as_tuple().digits) > MAX_NUMBER_DIGITS
+            or not DYNAMODB_CONTEXT.Emin <= v.adjusted() <= DYNAMODB_CONTEXT.Emax
+        ):
+            return serializer.serialize(v)
+    elif abs(v) >= _MAX_FAST_INT:
+        return serializer.serialize(v)
+    return {'N': str(v)}
+
+
+# Wire-format encoders for the scalar types items mostly hold; anything
+# else (sets, lists, maps, binary, None) goes through TypeSerializer
+_FAST_SERIALIZERS = {
+    str: lambda v: {'S': v},
+    Decimal: _serialize_number,
+    int: _serialize_number,
+    bool: lambda v: {'BOOL': v},
+}
+
+
+def serialize_item(item):
+    """Convert a Python item into the DynamoDB attribute-value wire format"""
+    serialized = {}
+    for k, v in item.items():
+        fast = _FAST_SERIALIZERS.get(type(v))
+        serialized[k] = fast(v) if fast else serializer.serialize(v)
+    return serialized
+
+
+def batch_request_items(table_name, chunk):
+    """Build the BatchWriteItem RequestItems for one chunk of items"""
+    return {table_name: [{'PutRequest': {'Item': serialize_item(item)}} for item in chunk]}
+
+
+def backoff_delay(attempt):
+    """Capped exponential delay with random jitter before retry `attempt`"""
+    delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+    return delay + random.uniform(0, delay)
+
+
+def log_unprocessed(table_name, request_items):
+    """Log how many items were still unprocessed after the last retry"""
+    logger.error(
+        f"{sum(len(v) for v in request_items.values())} items left unprocessed in {table_name}"
+    )
+
+
+def projection_params(projection):
+    """Build ProjectionExpression arguments for a list of attribute names"""
+    if not projection:
+        return {}
+    # Placeholders keep reserved words such as `name` or `timestamp` usable
+    names = {f'#a{i}': name for i, name in enumerate(projection)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names
+    }
+
+
+def condition_params(condition, expression_key, is_key_condition=False):
+    """Build low-level client arguments for a boto3 condition or a raw expression string"""
+    if isinstance(condition, str):
+        return {expression_key: condition}
+    expression = ConditionExpressionBuilder().build_expression(
+        condition, is_key_condition=is_key_condition
+    )
+    params = {expression_key: expression.condition_expression}
+    # DynamoDB rejects empty placeholder maps, e.g. for Attr(...).exists()
+    if expression.attribute_name_placeholders:
+        params['ExpressionAttributeNames'] = expression.attribute_name_placeholders
+    if expression.attribute_value_placeholders:
+        params['ExpressionAttributeValues'] = {
+            k: serializer.serialize(v)
+            for k, v in expression.attribute_value_placeholders.items()
+        }
+    return params
+
+
+def deserialize_item(item):
+    """Convert a DynamoDB wire-format item back into Python values"""
+    return {k: deserializer.deserialize(v) for k, v in item.items()}
+
+
+_END = object()
+
+
+def put_unless_stopped(buffer, value, stop):
+    """Put value on a bounded queue, giving up once `stop` is set; returns whether it was put"""
+    while not stop.is_set():
+        try:
+            buffer.put(value, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def prefetch(pages, maxsize=2):
+    """Iterate pages on a background thread, keeping up to `maxsize` pages ready"""
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for page in pages:
+                buffer.put((page, None))
+                if stop.is_set():
+                    return
+            buffer.put((_END, None))
+        except Exception as e:
+            buffer.put((_END, e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            page, error = buffer.get()
+            if error is not None:
+                raise error
+            if page is _END:
+                return
+            yield page
+    finally:
+        # Unblock the producer if the caller stops iterating early
+        stop.set()
+        while not buffer.empty():
+            buffer.get_nowait()
+
 
 class DynamoDBManager:
     """
     AWS DynamoDB Manager
     """
-    def __init__(self, region_name='us-east-1'):
-        self.dynamodb = boto3.resource('dynamodb', region_name=region_name)
-        self.client=boto3.client('dynamodb', region_name=region_name)
+    def __init__(self, region_name='us-east-1', dax_endpoint=None):
+        self.region_name = region_name
+        self.dax_endpoint = dax_endpoint
+        self.client = boto3.client('dynamodb', region_name=region_name, config=BOTO_CONFIG)
+        self._tables = {}
+        self._read_tables = {}
+
+    @cached_property
+    def dynamodb(self):
+        """DynamoDB resource, created on first use"""
+        return boto3.resource('dynamodb', region_name=self.region_name, config=BOTO_CONFIG)
+
+    @cached_property
+    def async_session(self):
+        """aioboto3 session for the async methods, created on first use"""
+        import aioboto3
+        return aioboto3.Session()
+
+    @cached_property
+    def dax_client(self):
+        """DAX client used for scans when dax_endpoint is set, else the DynamoDB client"""
+        if not self.dax_endpoint:
+            return self.client
+        import amazondax
+        return amazondax.AmazonDaxClient(
+            endpoint_url=self.dax_endpoint, region_name=self.region_name
+        )
+
+    @cached_property
+    def dax(self):
+        """DAX resource used for reads when dax_endpoint is set, else the DynamoDB resource"""
+        if not self.dax_endpoint:
+            return self.dynamodb
+        import amazondax
+        return amazondax.AmazonDaxClient.resource(
+            endpoint_url=self.dax_endpoint, region_name=self.region_name
+        )
+
+    def _read_table(self, table_name):
+        """Return a cached Table resource for reads, served by DAX when configured"""
+        if not self.dax_endpoint:
+            return self._table(table_name)
+        table = self._read_tables.get(table_name)
+        if table is None:
+            table = self._read_tables[table_name] = self.dax.Table(table_name)
+        return table
+
+    def _table(self, table_name):
+        """Return a cached Table resource for table_name"""
+        table = self._tables.get(table_name)
+        if table is None:
+            table = self._tables[table_name] = self.dynamodb.Table(table_name)
+        return table
 
     def create_table(self, table_name):
         """Create a DynamoDB table"""
@@ -56,7 +269,7 @@ class DynamoDBManager:
 
             # wait for table to be created
             table.wait_until_exists()
-            logger.info(f"Table {table_name} created successfully")
+            logger.info("Table %s created successfully", table_name)
             return table
         except Exception as e:
             logger.error(f"Error: {e}")
@@ -65,51 +278,107 @@ class DynamoDBManager:
     def put_item(self, table_name, item):
         """Insert an item into DynamoDB table"""
         try:
-            table = self.dynamodb.Table(table_name)
-            table.put_item(Item=item)
+            self.client.put_item(TableName=table_name, Item=serialize_item(item))
             logger.info("Item inserted successfully")
             return True
         except Exception as e:
             logger.error(f"Error: {e}")
             return False
         
-    def get_item(self, table_name, key):
-        """Get an item from dynamodb table"""
+    def get_item(self, table_name, key, projection=None):
+        """Get an item from dynamodb table, optionally only the attributes in `projection`"""
         try:
-            table = self.dynamodb.Table(table_name)
-            response = table.get_item(Key=key)
+            table = self._read_table(table_name)
+            response = table.get_item(Key=key, **projection_params(projection))
             return response.get('Item', None)
         except Exception as e:
             logger.error(f"Error: {e}")
             return None
         
-    def query_items(self, table_name, key_condition):
-        """Query items from DynamoDB table"""
+    def query_items(self, table_name, key_condition, projection=None):
+        """Query items from DynamoDB table, yielding items from every page"""
         try:
-            table = self.dynamodb.Table(table_name)
-            response = table.query(KeyConditionExpression=key_condition)
-            return response.get('Items', [])
+            # Build the expressions here; only the thread-safe client runs in the background
+            params = {
+                'TableName': table_name,
+                **condition_params(key_condition, 'KeyConditionExpression', is_key_condition=True)
+            }
+            projection = projection_params(projection)
+            if projection:
+                params['ProjectionExpression'] = projection['ProjectionExpression']
+                params['ExpressionAttributeNames'] = {
+                    **params.get('ExpressionAttributeNames', {}),
+                    **projection['ExpressionAttributeNames']
+                }
+            pages = self._query_pages(self.dax_client, params)
+            for page in prefetch(pages):
+                yield from page
         except Exception as e:
             logger.error(f"Error: {e}")
-            return []
+            raise
+
+    def _query_pages(self, client, params):
+        """Yield the deserialized Items of each query page, following LastEvaluatedKey"""
+        while True:
+            response = client.query(**params)
+            yield [deserialize_item(item) for item in response.get('Items', [])]
+            if 'LastEvaluatedKey' not in response:
+                return
+            params['ExclusiveStartKey'] = response['LastEvaluatedKey']
         
-    def scan_items(self, table_name, filter_expression=None):
-        """Scan items in DynamoDB table"""
+    def scan_items(self, table_name, filter_expression=None, total_segments=8):
+        """Scan items in DynamoDB table using a parallel segmented scan, yielding items"""
         try:
-            table = self.dynamodb.Table(table_name)
+            params = {'TableName': table_name, 'TotalSegments': total_segments}
             if filter_expression:
-                response = table.scan(FilterExpression=filter_expression)
-            else:
-                response = table.scan()
-            return response.get('Items', [])
+                params.update(condition_params(filter_expression, 'FilterExpression'))
+
+            # Resolve the lazily built client here, not concurrently in the workers
+            client = self.dax_client
+            # Bounded so memory stays at a few pages per segment, not the whole table
+            pages = queue.Queue(maxsize=2 * total_segments)
+            stop = threading.Event()
+            executor = ThreadPoolExecutor(max_workers=total_segments)
+            try:
+                for segment in range(total_segments):
+                    executor.submit(self._scan_segment, client, params, segment, pages, stop)
+                remaining = total_segments
+                while remaining:
+                    page, error = pages.get()
+                    if error is not None:
+                        raise error
+                    if page is _END:
+                        remaining -= 1
+                        continue
+                    yield from page
+            finally:
+                # Don't keep scanning if the caller stops early or a segment fails
+                stop.set()
+                executor.shutdown(wait=False, cancel_futures=True)
         except Exception as e:
             logger.error(f"Error: {e}")
-            return []
+            raise
+
+    def _scan_segment(self, client, params, segment, pages, stop):
+        """Push each page of one scan segment onto `pages` until drained or `stop` is set"""
+        params = dict(params, Segment=segment)
+        try:
+            while True:
+                response = client.scan(**params)
+                items = [deserialize_item(item) for item in response.get('Items', [])]
+                if not put_unless_stopped(pages, (items, None), stop):
+                    return
+                if 'LastEvaluatedKey' not in response:
+                    break
+                params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            put_unless_stopped(pages, (_END, None), stop)
+        except Exception as e:
+            put_unless_stopped(pages, (_END, e), stop)
         
     def update_items(self, table_name, key, update_expression, expression_values):
         """Update an item in DynamoDB table"""
         try:
-            table = self.dynamodb.Table(table_name)
+            table = self._table(table_name)
             response = table.update_item(
                 Key=key,
                 UpdateExpression=update_expression,
@@ -124,7 +393,7 @@ class DynamoDBManager:
     def delete_item(self, table_name, key):
         """Delete an item from DynamoDB table"""
         try:
-            table = self.dynamodb.Table(table_name)
+            table = self._table(table_name)
             table.delete_item(Key=key)
             logger.info("Item deleted successfully")
             return True
@@ -132,19 +401,91 @@ class DynamoDBManager:
             logger.error(f"Error: {e}")
             return False
     
-    def batch_write(self, table_name, items):
-        """Batch write items to DynamoDB"""
+    def batch_write(self, table_name, items, max_workers=16):
+        """Batch write items to DynamoDB, sending 25-item chunks in parallel"""
         try:
-            table = self.dynamodb.Table(table_name)
-            with table.batch_writer() as batch:
-                for item in items:
-                    batch.put_item(Item=item)
-            logger.info(f"{len(items)} items written successfully")
+            chunks = [
+                items[i:i + BATCH_WRITE_SIZE]
+                for i in range(0, len(items), BATCH_WRITE_SIZE)
+            ]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(
+                    lambda chunk: self._write_chunk(table_name, chunk),
+                    chunks
+                ))
+            if not all(results):
+                logger.error(f"Some items could not be written to {table_name}")
+                return False
+            logger.info("%d items written successfully", len(items))
             return True
         except Exception as e:
             logger.error(f"Error: {e}")
             return False
+
+    def _write_chunk(self, table_name, chunk, max_attempts=10):
+        """Write one chunk with BatchWriteItem, retrying unprocessed items with jittered backoff"""
+        request_items = batch_request_items(table_name, chunk)
+        for attempt in range(max_attempts):
+            if attempt:
+                time.sleep(backoff_delay(attempt))
+            response = self.client.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems')
+            if not request_items:
+                return True
+        log_unprocessed(table_name, request_items)
+        return False
         
+    def async_client(self):
+        """Async context manager yielding an aioboto3 DynamoDB client"""
+        return self.async_session.client(
+            'dynamodb', region_name=self.region_name, config=BOTO_CONFIG
+        )
+
+    async def batch_write_async(self, table_name, items, dynamodb_client=None, max_concurrency=16):
+        """
+        Batch write items to DynamoDB, sending 25-item chunks concurrently on one event loop.
+        Pass an open client from async_client() to reuse its connections across calls.
+        """
+        if dynamodb_client is None:
+            async with self.async_client() as dynamodb_client:
+                return await self.batch_write_async(
+                    table_name, items, dynamodb_client, max_concurrency
+                )
+        starts = iter(range(0, len(items), BATCH_WRITE_SIZE))
+        results = []
+
+        async def worker():
+            # Workers share one iterator, so at most max_concurrency chunks are in flight
+            for start in starts:
+                try:
+                    results.append(await self._write_chunk_async(
+                        dynamodb_client, table_name, items[start:start + BATCH_WRITE_SIZE]
+                    ))
+                except Exception as e:
+                    logger.error(f"Error: {e}")
+                    results.append(False)
+
+        # Workers handle their own errors, so this waits for every chunk, like batch_write
+        await asyncio.gather(*(worker() for _ in range(max_concurrency)))
+        if not all(results):
+            logger.error(f"Some items could not be written to {table_name}")
+            return False
+        logger.info("%d items written successfully", len(items))
+        return True
+
+    async def _write_chunk_async(self, client, table_name, chunk, max_attempts=10):
+        """Async counterpart of _write_chunk"""
+        request_items = batch_request_items(table_name, chunk)
+        for attempt in range(max_attempts):
+            if attempt:
+                await asyncio.sleep(backoff_delay(attempt))
+            response = await client.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems')
+            if not request_items:
+                return True
+        log_unprocessed(table_name, request_items)
+        return False
+
 # Usage
 db = DynamoDBManager()
 
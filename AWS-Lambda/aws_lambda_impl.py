@@ -2,8 +2,28 @@ import json
 import boto3
 import logging
 from datetime import datetime
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    import orjson
+
+    def json_dumps(obj):
+        """
+        Encode obj with orjson, retrying with the stdlib encoder for input orjson
+        rejects (e.g. ints beyond 64 bits). Unlike json.dumps, NaN and Infinity
+        are encoded as null.
+        """
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            return json.dumps(obj)
+
+    json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    json_dumps = json.dumps
+    json_loads = json.loads
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -11,6 +31,30 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Client settings shared by the handler and LambdaManager
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# Created once per execution environment so warm invocations reuse it
+s3_client = boto3.client('s3', config=BOTO_CONFIG)
+# Parse the GetObject operation model during init rather than on the first event
+s3_client.meta.service_model.operation_model('GetObject')
+
+# Suffix of the mirror copy written by S3Manager.upload_file_double
+ALT_SUFFIX = '.s3manager-mirror'
+
+
+def get_object_fallback(bucket, key):
+    """Get an S3 object, falling back to its mirror copy if the key is not visible yet"""
+    try:
+        return s3_client.get_object(Bucket=bucket, Key=key)
+    except s3_client.exceptions.NoSuchKey:
+        logger.info("Object %s not found, reading %s%s", key, key, ALT_SUFFIX)
+        return s3_client.get_object(Bucket=bucket, Key=key + ALT_SUFFIX)
+
 
 def lambda_handler(event, context):
     """
@@ -22,20 +66,26 @@ def lambda_handler(event, context):
         bucket = event["Records"][0]['s3']['bucket']['name']
         key = event['Records'][0]['s3']['object']['key']
 
-        logger.info(f"Processing file: {key} from bucket: {bucket}")
+        # The mirror copy triggers its own event; only the primary is processed
+        if key.endswith(ALT_SUFFIX):
+            return {
+                "statusCode": 200,
+                "body": json_dumps({'file_name': key, 'status': 'skipped'})
+            }
 
-        # Initialize S3 Client
-        s3_client = boto3.client('s3')
+        logger.info("Processing file: %s from bucket: %s", key, bucket)
 
         # Get the object
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        content = response['Body'].read().decode('utf-8')
+        response = get_object_fallback(bucket, key)
+
+        # Process the content in 1MB chunks instead of loading it all
+        line_count = 1
+        for chunk in response['Body'].iter_chunks(chunk_size=1 << 20):
+            line_count += chunk.count(b'\n')
 
-        # Process the content
-        lines = content.split('\n')
         processed_data = {
             'file_name': key,
-            'line_count': len(lines),
+            'line_count': line_count,
             'processed_at': datetime.now().isoformat(),
             'status': 'success'
         }
@@ -43,13 +93,13 @@ def lambda_handler(event, context):
         # Return response
         return {
             "statusCode": 200,
-            "body": json.dumps(processed_data)
+            "body": json_dumps(processed_data)
         }
     except Exception as e:
         logger.error(f"Error: {e}")
         return {
             'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+            'body': json_dumps({'error': str(e)})
         }
     
 
@@ -58,7 +108,7 @@ def lambda_handler(event, context):
 class LambdaManager:
     """Lambda Manger"""
     def __init__(self, region_name='us-east-1'):
-        self.lambda_client = boto3.client('lambda', region_name=region_name)
+        self.lambda_client = boto3.client('lambda', region_name=region_name, config=BOTO_CONFIG)
 
     def create_function(self, function_name, role_arn, zip_file_path):
         """Create a Lambda function"""
@@ -80,7 +130,7 @@ class LambdaManager:
                     }
                 }
             )
-            logger.info(f"Function {function_name} created successfully")
+            logger.info("Function %s created successfully", function_name)
             return response
         except ClientError as ce:
             logger.error(f"Error: {ce}")
@@ -92,9 +142,9 @@ class LambdaManager:
             response = self.lambda_client.invoke(
                 FunctionName=function_name,
                 InvocationType='RequestResponse',
-                Payload=json.dumps(payload)
+                Payload=json_dumps(payload)
             )
-            result = json.loads(response['Payload'].read())
+            result = json_loads(response['Payload'].read())
             return result
         except ClientError as ce:
             logger.error(f"Error: {ce}")
@@ -110,7 +160,7 @@ class LambdaManager:
                 FunctionName=function_name,
                 ZipFile=zipped_code
             )
-            logger.info(f"Function {function_name} updated successfully")
+            logger.info("Function %s updated successfully", function_name)
             return response
         except ClientError as ce:
             logger.error(f"Error: {ce}")
@@ -1,6 +1,14 @@
+import io
 import os
 import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 logging.basicConfig(
@@ -10,12 +18,68 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Split objects over 8MB into 8MB parts transferred on up to 16 threads
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True
+)
+
+# Enough pooled connections for multipart transfers and prefetching
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# Suffix of the mirror copy written by upload_file_double
+ALT_SUFFIX = '.s3manager-mirror'
+
+_END = object()
+
+
+def prefetch(pages, maxsize=2):
+    """Iterate pages on a background thread, keeping up to `maxsize` pages ready"""
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for page in pages:
+                buffer.put((page, None))
+                if stop.is_set():
+                    return
+            buffer.put((_END, None))
+        except Exception as e:
+            buffer.put((_END, e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            page, error = buffer.get()
+            if error is not None:
+                raise error
+            if page is _END:
+                return
+            yield page
+    finally:
+        # Unblock the producer if the caller stops iterating early
+        stop.set()
+        while not buffer.empty():
+            buffer.get_nowait()
+
 
 class S3Manager:
     """S3 manager class"""
     def __init__(self, region_name='us-east-1'):
-        self.s3_client = boto3.client('s3', region_name=region_name)
-        self.s3_resources = boto3.resource('s3', region_name=region_name)
+        self.region_name = region_name
+        self.s3_client = boto3.client('s3', region_name=region_name, config=BOTO_CONFIG)
+
+    @cached_property
+    def s3_resources(self):
+        """S3 resource, created on first use"""
+        return boto3.resource('s3', region_name=self.region_name, config=BOTO_CONFIG)
 
     def create_bucket(self, bucket_name, region=None):
         """Create an S3 bucket"""
@@ -28,7 +92,7 @@ class S3Manager:
                     Bucket=bucket_name,
                     CreateBucketConfiguration=location
                 )
-            logger.info(f"Bucket {bucket_name} created successflly")
+            logger.info("Bucket %s created successflly", bucket_name)
             return True
         except ClientError as ce:
             logger.error(f"Error: {ce}")
@@ -40,43 +104,137 @@ class S3Manager:
             object_name = os.path.basename(file_path)
         
         try:
-            self.s3_client.upload_file(file_path, bucket_name, object_name)
-            logger.info(f"File {file_path} uploaded to {bucket_name}/{object_name}")
+            self.s3_client.upload_file(
+                file_path, bucket_name, object_name, Config=TRANSFER_CONFIG
+            )
+            logger.info("File %s uploaded to %s/%s", file_path, bucket_name, object_name)
             return True
         except ClientError as ce:
             logger.error(f"Error: {ce}")
             return False
         
+    def upload_file_double(self, file_path, bucket_name, object_name=None):
+        """Upload a file to object_name and its mirror copy in parallel"""
+        if object_name is None:
+            object_name = os.path.basename(file_path)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(
+                lambda name: self.upload_file(file_path, bucket_name, name),
+                [object_name, object_name + ALT_SUFFIX]
+            ))
+        return all(results)
+
+    def get_object_fallback(self, bucket_name, object_name):
+        """Get an object, falling back to its mirror copy if the key is not visible yet"""
+        try:
+            try:
+                return self.s3_client.get_object(Bucket=bucket_name, Key=object_name)
+            except self.s3_client.exceptions.NoSuchKey:
+                logger.info("Object %s not found, reading %s%s", object_name, object_name, ALT_SUFFIX)
+                return self.s3_client.get_object(
+                    Bucket=bucket_name, Key=object_name + ALT_SUFFIX
+                )
+        except ClientError as ce:
+            logger.error(f"Error: {ce}")
+            return None
+
     def download_file(self, bucket_name, object_name, file_path):
         """Download a file from S3 bucket"""
         try:
-            self.s3_client.download_file(bucket_name, object_name, file_path)
-            logger.info(f"File downloaded to {file_path}")
+            self.s3_client.download_file(
+                bucket_name, object_name, file_path, Config=TRANSFER_CONFIG
+            )
+            logger.info("File downloaded to %s", file_path)
             return True
         except ClientError as ce:
             logger.error(f"Error:{ce}")
             return False
         
-    def list_objects(self, bucket_name, prefix=''):
-        """List objects in a bucket"""
+    def download_fileobj_to_buffer(self, bucket_name, object_name):
+        """Download an object into memory, returning a BytesIO positioned at the start"""
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=bucket_name,
-                Prefix=prefix
+            buffer = io.BytesIO()
+            self.s3_client.download_fileobj(
+                bucket_name, object_name, buffer, Config=TRANSFER_CONFIG
             )
+            buffer.seek(0)
+            logger.info("Object %s downloaded into memory", object_name)
+            return buffer
+        except ClientError as ce:
+            logger.error(f"Error: {ce}")
+            return None
 
-            if 'Contents' in response:
-                return [obj['Key'] for obj in response['Contents']]
-            return []
+    def list_objects(self, bucket_name, prefix=''):
+        """List objects in a bucket, yielding keys from every page"""
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+            for page in prefetch(pages):
+                for obj in page.get('Contents', []):
+                    yield obj['Key']
         except ClientError as ce:
             logger.error(f"Error : {ce}")
-            return []
+            raise
         
+    def iter_objects_prefetched(self, bucket_name, keys, max_in_flight=4):
+        """
+        Yield (key, body) for each key, fetching up to `max_in_flight` objects ahead.
+        body is None for keys that could not be fetched.
+        """
+        def fetch(key):
+            response = self.s3_client.get_object(Bucket=bucket_name, Key=key)
+            return response['Body'].read()
+
+        keys = iter(keys)
+        executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        try:
+            pending = deque(
+                (key, executor.submit(fetch, key))
+                for _, key in zip(range(max_in_flight), keys)
+            )
+            while pending:
+                key, future = pending.popleft()
+                next_key = next(keys, _END)
+                if next_key is not _END:
+                    pending.append((next_key, executor.submit(fetch, next_key)))
+                try:
+                    body = future.result()
+                except ClientError as ce:
+                    logger.error(f"Error: {ce}")
+                    body = None
+                yield key, body
+        finally:
+            # Don't wait for queued downloads if the caller stops early
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def delete_object(self, bucket_name, object_name):
         """Delete an object from S3 bucket"""
         try:
             self.s3_client.delete_object(Bucket=bucket_name, Key=object_name)
-            logger.info(f"Object {object_name} deleted from {bucket_name}")
+            logger.info("Object %s deleted from %s", object_name, bucket_name)
+            return True
+        except ClientError as ce:
+            logger.error(f"Error: {ce}")
+            return False
+
+    def delete_object_double(self, bucket_name, object_name):
+        """Delete an object written by upload_file_double together with its mirror copy"""
+        try:
+            # Leaving the mirror behind would let get_object_fallback resurrect it
+            response = self.s3_client.delete_objects(
+                Bucket=bucket_name,
+                Delete={
+                    'Objects': [{'Key': object_name}, {'Key': object_name + ALT_SUFFIX}],
+                    'Quiet': True
+                }
+            )
+            errors = response.get('Errors', [])
+            for error in errors:
+                logger.error(f"Error deleting {error['Key']}: {error.get('Message')}")
+            if errors:
+                return False
+            logger.info("Object %s and its mirror deleted from %s", object_name, bucket_name)
             return True
         except ClientError as ce:
             logger.error(f"Error: {ce}")
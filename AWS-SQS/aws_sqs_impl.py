@@ -1,22 +1,78 @@
+import asyncio
 import boto3
 import json
-from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 import logging
 
+try:
+    import orjson
+
+    def json_dumps(obj):
+        """
+        Encode obj with orjson, retrying with the stdlib encoder for input orjson
+        rejects (e.g. ints beyond 64 bits). Unlike json.dumps, NaN and Infinity
+        are encoded as null.
+        """
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            return json.dumps(obj)
+
+    json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    json_dumps = json.dumps
+    json_loads = json.loads
+
 logging.basicConfig(
-    level=logging.info,
+    level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
 logger = logging.getLogger(__name__)
 
+# SendMessageBatch and DeleteMessageBatch accept at most 10 entries per call
+SQS_BATCH_SIZE = 10
+
+# Shared client settings: keep-alive pooled connections, adaptive retries
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+
+def delete_entries(receipt_handles):
+    """Build DeleteMessageBatch entries for a list of receipt handles"""
+    return [{'Id': str(i), 'ReceiptHandle': rh} for i, rh in enumerate(receipt_handles)]
+
+
+def log_delete_response(response):
+    """Log the outcome of a DeleteMessageBatch call"""
+    for failure in response.get('Failed', []):
+        logger.error(f"Error deleting message {failure['Id']}: {failure.get('Message')}")
+    logger.info("%d messages deleted successfully", len(response.get('Successful', [])))
+
 
 class SQSManager:
     """AWS Queue service Manager"""
 
     def __init__(self, region_name='us-east-1'):
-        self.sqs = boto3.client('sqs', region_name=region_name)
-        self.resource = boto3.resource('sqs', region_name=region_name)
+        self.region_name = region_name
+        self.sqs = boto3.client('sqs', region_name=region_name, config=BOTO_CONFIG)
+
+    @cached_property
+    def resource(self):
+        """SQS resource, created on first use"""
+        return boto3.resource('sqs', region_name=self.region_name, config=BOTO_CONFIG)
+
+    @cached_property
+    def async_session(self):
+        """aioboto3 session for the async methods, created on first use"""
+        import aioboto3
+        return aioboto3.Session()
 
     def create_queue(self, queue_name, fifo=False):
         """Create an SQS queue"""
@@ -34,7 +90,7 @@ class SQSManager:
                 Attributes=attributes
             )
             queue_url = response['QueueUrl']
-            logger.info(f"Queue created: {queue_url}")
+            logger.info("Queue created: %s", queue_url)
             return None
 
         except ClientError as ce:
@@ -55,37 +111,65 @@ class SQSManager:
         try:
             params = {
                 'QueueUrl': queue_url,
-                'MessageBody': json.dumps(message_body) if isinstance(message_body, dict) else message_body
+                'MessageBody': json_dumps(message_body) if isinstance(message_body, dict) else message_body
             }
             
             if message_attributes:
                 params['MessageAttributes'] = message_attributes
 
             response = self.sqs.send_message(**params)
-            logger.info(f"Message sent: {response['MessageId']}")
+            logger.info("Message sent: %s", response['MessageId'])
             return response['MessageId']
         except ClientError as ce:
             logger.error(f"Error: {ce}")
             return None
         
-    def send_message_batch(self, queue_url, messages):
-        """Send multiple messages to SQS queue"""
+    def send_message_batch(self, queue_url, messages, max_workers=16):
+        """
+        Send multiple messages to SQS queue, 10 per request in parallel.
+        Dict messages are sent as JSON, anything else as-is. Entries of a
+        request that errors are reported under 'Failed'.
+        """
+        entries = [
+            {'Id': str(i), 'MessageBody': json_dumps(msg) if isinstance(msg, dict) else msg}
+            for i, msg in enumerate(messages)
+        ]
+        chunks = [
+            entries[i:i + SQS_BATCH_SIZE]
+            for i in range(0, len(entries), SQS_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(executor.map(
+                lambda chunk: self._send_chunk(queue_url, chunk),
+                chunks
+            ))
+        response = {
+            'Successful': [e for r in responses for e in r.get('Successful', [])],
+            'Failed': [e for r in responses for e in r.get('Failed', [])]
+        }
+        logger.info("%d messages sent successfully", len(response['Successful']))
+        return response
+
+    def _send_chunk(self, queue_url, chunk):
+        """Send one chunk of entries, reporting a request error as failed entries"""
         try:
-            entries = []
-            for i, msg in enumerate(messages):
-                entries.append({
-                    'Id': str(i),
-                    'MessageBody': json.dumps(msg) if isinstance(msg, dict) else msg
-                })
-            response = self.sqs.send_message_batch(
-                QueueUrl=queue_url,
-                Entries=entries
-            )
-            logger.info(f"{len(response["Successful"])} messages sent successfully")
-            return response
-        except ClientError as ce:
-            logger.error(f"Error : {ce}")
-            return None
+            return self.sqs.send_message_batch(QueueUrl=queue_url, Entries=chunk)
+        except (ClientError, BotoCoreError) as e:
+            # Connection errors and timeouts have no service response; report them
+            # under their exception name so the chunk still shows up as failed
+            logger.error(f"Error : {e}")
+            error = e.response.get('Error', {}) if isinstance(e, ClientError) else {}
+            return {
+                'Failed': [
+                    {
+                        'Id': entry['Id'],
+                        'SenderFault': error.get('Type') == 'Sender',
+                        'Code': error.get('Code', type(e).__name__),
+                        'Message': error.get('Message', str(e))
+                    }
+                    for entry in chunk
+                ]
+            }
         
     def receive_messages(self, queue_url, max_messages=10, wait_time=10):
         """Receive messages from SQS queue"""
@@ -98,7 +182,7 @@ class SQSManager:
                 AttributeNames=['All']
             )
             messages = response.get('Messages', [])
-            logger.info(f"Received {len(messages)} messages")
+            logger.info("Received %d messages", len(messages))
             return messages
         except ClientError as ce:
             logger.error(f"Error: {ce}")
@@ -117,21 +201,103 @@ class SQSManager:
             logger.error(f"Error: {ce}")
             return False
         
-    def process_messages(self, queue_url, processor_func):
-        """Process messages from queue with a custom function"""
+    def delete_message_batch(self, queue_url, receipt_handles):
+        """Delete up to 10 messages from SQS queue in a single call"""
+        try:
+            response = self.sqs.delete_message_batch(
+                QueueUrl=queue_url,
+                Entries=delete_entries(receipt_handles)
+            )
+            log_delete_response(response)
+            return response
+        except ClientError as ce:
+            logger.error(f"Error: {ce}")
+            return None
+
+    def process_messages(self, queue_url, processor_func, max_workers=1):
+        """
+        Process messages from queue with a custom function.
+        max_workers > 1 runs processor_func on a thread pool for I/O-bound,
+        thread-safe processors; do not use it with FIFO queues, since it
+        breaks per-group ordering.
+        """
         messages = self.receive_messages(queue_url)
+        if not messages:
+            return
 
-        for message in messages:
+        def process(message):
             try:
                 # process the message
-                body = json.loads(message['Body'])
+                body = json_loads(message['Body'])
                 processor_func(body)
-
-                # Delete message after successful processing
-                self.delete_message(queue_url, message['ReceiptHandle'])
+                return message['ReceiptHandle']
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
                 # Message will become visible again after visibility timeout
+                return None
+
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(process, messages))
+        else:
+            results = [process(message) for message in messages]
+        receipt_handles = [rh for rh in results if rh]
+
+        # Delete successfully processed messages in one call
+        if receipt_handles:
+            self.delete_message_batch(queue_url, receipt_handles)
+
+    def async_client(self):
+        """Async context manager yielding an aioboto3 SQS client"""
+        return self.async_session.client(
+            'sqs', region_name=self.region_name, config=BOTO_CONFIG
+        )
+
+    async def process_messages_async(self, queue_url, async_processor, sqs_client=None):
+        """
+        Process messages from queue with an async function on a single event loop.
+        When polling in a loop, open one client with async_client() and pass it as
+        sqs_client so every poll reuses the same connections.
+        """
+        if sqs_client is None:
+            async with self.async_client() as sqs_client:
+                return await self.process_messages_async(queue_url, async_processor, sqs_client)
+
+        try:
+            response = await sqs_client.receive_message(
+                QueueUrl=queue_url,
+                MaxNumberOfMessages=SQS_BATCH_SIZE,
+                WaitTimeSeconds=10, # Long polling
+                MessageAttributeNames=['All'],
+                AttributeNames=['All']
+            )
+        except ClientError as ce:
+            logger.error(f"Error: {ce}")
+            return
+        messages = response.get('Messages', [])
+        logger.info("Received %d messages", len(messages))
+
+        async def process(message):
+            try:
+                await async_processor(json_loads(message['Body']))
+                return message['ReceiptHandle']
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+                return None
+
+        results = await asyncio.gather(*(process(m) for m in messages))
+        receipt_handles = [rh for rh in results if rh]
+        if not receipt_handles:
+            return
+
+        try:
+            response = await sqs_client.delete_message_batch(
+                QueueUrl=queue_url,
+                Entries=delete_entries(receipt_handles)
+            )
+            log_delete_response(response)
+        except ClientError as ce:
+            logger.error(f"Error: {ce}")
 
 # Usage Example: Producer-Consumer Pattern
 sqs = SQSManager()
@@ -147,9 +313,9 @@ sqs.send_message(queue_url, task)
 
 # Consumer
 def process_task(task_data):
-    logger.info(f"Processing task: {task_data['task_id']}")
+    logger.info("Processing task: %s", task_data['task_id'])
     # Business Logic
 
-    logger.info(f"Action: {task_data['action']}")
+    logger.info("Action: %s", task_data['action'])
 
 sqs.process_messages(queue_url, process_task)